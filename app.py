@@ -11,31 +11,30 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 # 🚀 どんなスレッドからでも参照できるよう、OSの環境変数にキーを強制セット
-if "GEMINI_API_KEY" in st.secrets:
-    os.environ["GOOGLE_API_KEY"] = st.secrets["GEMINI_API_KEY"]
-if "GOOGLE_API_KEY" in st.secrets:
-    os.environ["GOOGLE_API_KEY"] = st.secrets["GOOGLE_API_KEY"]
+# (プロセスで一度だけ実行。GOOGLE_API_KEY が GEMINI_API_KEY より優先)
+@st.cache_resource
+def _export_api_key_env():
+    api_key = st.secrets.get("GOOGLE_API_KEY") or st.secrets.get("GEMINI_API_KEY")
+    if api_key:
+        os.environ["GOOGLE_API_KEY"] = api_key
+
+_export_api_key_env()
 
 import logging
 import time
 import threading
-import json
+import orjson
 import hashlib
 import uuid
-from queue import Queue, Empty
+from collections import deque
+from queue import SimpleQueue, Empty
 
-from streamlit_autorefresh import st_autorefresh
 
-from youtube_monitor import ChatItem, start_youtube_monitor
+from youtube_monitor import ChatItem, MAX_PENDING_ITEMS
 
 # --- Modular Imports ---
 from core_paths import PathManager, LOCAL_STATIC_DIR
-from core_ai_worker import init_worker
-
-# 🚀 モジュールレベルキャッシュ: 動画Base64マップを一度だけ生成し、全rerunsで再利用
-# (session_stateに入れるとOOM、毎回読み直すとHTMLが変わるかもしれない)
-_VIDEO_B64_CACHE = None
-_HTML_TEMPLATE_CACHE = None
+from core_cache import GREETING_CACHE_FILE, GREETING_PROMPT, load_greeting_cache, schedule_greeting_cache
 
 # ============================================================
 # Configuration
@@ -43,6 +42,10 @@ _HTML_TEMPLATE_CACHE = None
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# seconds: 結果到着フラグの確認間隔 (フラグメントのみ再実行)。処理中/待ち行列ありは短く、アイドル時は長く
+RESULT_WATCH_INTERVAL_BUSY = 1
+RESULT_WATCH_INTERVAL_IDLE = 5
+
 st.set_page_config(
     page_title="AI阪口源太 - 与那国町議会議員",
     page_icon="🏝️",
@@ -75,59 +78,91 @@ hide_css = """
     }
 </style>
 """
-st.markdown(hide_css, unsafe_allow_html=True)
-
-if is_embed:
-    # Extra CSS to hide EVERYTHING except the avatar
-    st.markdown("""
-    <style>
-        .stTextInput, .stButton, [data-testid="stBottom"] {
-            display: none !important;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+# Extra CSS to hide EVERYTHING except the avatar
+embed_css = """
+<style>
+    .stTextInput, .stButton, [data-testid="stBottom"] {
+        display: none !important;
+    }
+</style>
+"""
+# 🚀 1回のst.markdownにまとめて送る (rerun毎のwebsocketメッセージを1つに)
+st.markdown(hide_css + embed_css if is_embed else hide_css, unsafe_allow_html=True)
 
 
 # ============================================================
 # Session State Initialization
 # ============================================================
-if "queue" not in st.session_state:
-    st.session_state.queue = Queue()
-
-if "processing" not in st.session_state:
-    st.session_state.processing = False
-if "last_proc_start" not in st.session_state:
-    st.session_state.last_proc_start = 0.0
-if "progress_msg" not in st.session_state:
-    st.session_state.progress_msg = "Ready"
+# 🚀 初期化済みかどうかは番兵キー1つで判定 (rerun毎に十数回の `in` チェックをしない)
+if "_initialized" not in st.session_state:
+    st.session_state.update({
+        # task_done/join は使わないので、軽量なC実装の SimpleQueue で受け渡す
+        "queue": SimpleQueue(),
+        "processing": False,
+        "last_proc_start": 0.0,
+        "progress_msg": "Ready",
+        "history": deque(maxlen=20),  # 上限超過分はappend時にO(1)で破棄
+        "yt_thread": None,
+        "yt_stop": None,
+        "output_queue": SimpleQueue(),
+        "result_event": threading.Event(),  # Worker → UI の結果到着通知
+        "worker_thread": None,
+        "worker_stop": None,
+        "current_avatar_task": None,
+        "session_id": uuid.uuid4().hex[:8],
+    })
+    st.session_state._initialized = True
 
-if "history" not in st.session_state:
-    st.session_state.history = []
 
-if "yt_thread" not in st.session_state:
-    st.session_state.yt_thread = None
-    st.session_state.yt_stop = None
-
-if "output_queue" not in st.session_state:
-    st.session_state.output_queue = Queue()
+# ============================================================
+# Greeting Cache (process-wide pre-warm)
+# ============================================================
+@st.cache_resource(max_entries=1)
+def _load_greeting_cache(mtime: float):
+    """挨拶キャッシュをプロセス全体で共有する (全セッション共有・読み取り専用)
+    mtimeをキーにするため、ファイルが書き換えられた時だけ再パースされる。"""
+    try:
+        cached_data = load_greeting_cache()
+        if cached_data:
+            logger.info(f"[Cache] Pre-warmed greeting from {GREETING_CACHE_FILE.name}")
+        return cached_data
+    except Exception as e:
+        logger.warning(f"[Cache] Failed to load disk cache: {e}")
+        return None
 
-if "worker_thread" not in st.session_state:
-    st.session_state.worker_thread = None
-    st.session_state.worker_stop = None
 
-if "current_avatar_task" not in st.session_state:
-    st.session_state.current_avatar_task = None
+def _greeting_cache_mtime() -> float:
+    try:
+        return GREETING_CACHE_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return 0.0
 
 
 # ============================================================
 # YouTube Monitor (start once)
 # ============================================================
+@st.cache_resource
+def _youtube_settings():
+    """YouTube監視の設定をプロセス全体で一度だけ secrets から読む"""
+    return bool(st.secrets.get("ENABLE_YOUTUBE_MONITOR", False)), st.secrets.get("YT_ID", "")
+
+
+@st.cache_resource
+def _contact_settings():
+    """ページ下部のリンク設定をプロセス全体で一度だけ secrets から読む (rerun毎に読まない)"""
+    return (
+        st.secrets.get("AVATAR_NAME", "阪口源太"),
+        st.secrets.get("SOCIAL_X_URL", "https://x.com/genta2223"),
+        st.secrets.get("GITHUB_REPO_URL", "https://github.com/genta2223/ai-sakguchi"),
+    )
+
+
 def init_youtube_monitor():
     """Start YouTube monitor if enabled and not already running."""
-    enable = st.secrets.get("ENABLE_YOUTUBE_MONITOR", False)
-    video_id = st.secrets.get("YT_ID", "")
+    enable, video_id = _youtube_settings()
 
     if enable and video_id and st.session_state.yt_thread is None:
+        from youtube_monitor import start_youtube_monitor
         thread, stop_event = start_youtube_monitor(video_id, st.session_state.queue)
         st.session_state.yt_thread = thread
         st.session_state.yt_stop = stop_event
@@ -138,96 +173,141 @@ def init_youtube_monitor():
 # ============================================================
 # Process Queue Handlers
 # ============================================================
-def poll_results(session_id: str) -> bool:
-    """Checks the output queue for finished tasks. Returns True if a new result was found."""
-    found_result = False
+def _drain_queue(q: SimpleQueue):
+    """キューを空にする (インスタンスは維持)。Workerと取り合ってもEmptyで安全に抜ける。"""
     try:
         while True:
-            res = st.session_state.output_queue.get_nowait()
-            if res["type"] == "progress":
-                st.session_state.progress_msg = res["msg"]
-                st.session_state.processing = True
-            elif res["type"] == "result":
-                text_hash = hashlib.md5(res["response_text"].encode("utf-8")).hexdigest()[:8]
-                task_id = f"{time.time()}_{text_hash}"
-
-                task_data = {
-                    "task_id": task_id,
-                    "audio_b64": res["audio_b64"],
-                    "emotion": res["emotion"],
-                    "response_text": res["response_text"],
-                    "is_initial_greeting": res.get("is_initial_greeting", False)
-                }
-                
-                st.session_state.current_avatar_task = task_data
-                logger.info(f"[App] Updated in-memory task: {task_id}")
-                
-                if res.get("is_initial_greeting"):
-                    st.session_state.greeting_task_cache = task_data
-                    try:
-                        cache_file = LOCAL_STATIC_DIR / "greeting_cache.json"
-                        with open(cache_file, "w", encoding="utf-8") as f:
-                            json.dump(task_data, f, ensure_ascii=False, indent=2)
-                        logger.info(f"[Cache] Saved initial greeting to physical file: {cache_file.name}")
-                    except Exception as e:
-                        logger.warning(f"[Cache] Failed to save to physical file: {e}")
-
-                st.session_state.history.append({
-                    "question": res["question"],
-                    "author": res["author"],
-                    "response": res["response_text"],
-                    "emotion": res["emotion"],
-                })
-                if len(st.session_state.history) > 20:
-                    st.session_state.history = st.session_state.history[-20:]
-                
-                st.session_state.processing = False
-                st.session_state.progress_msg = "Ready"
-                found_result = True
-            
-            elif res["type"] == "error":
-                st.session_state.processing = False
-                st.session_state.progress_msg = f"Error: {res['msg']}"
+            q.get_nowait()
     except Empty:
         pass
-    return found_result
+
+
+def _build_avatar_task(res: dict) -> dict:
+    """Workerの結果からアバター用のタスクを組み立てる"""
+    # 非暗号用途の識別子なので、MD5ではなく軽量なBLAKE2b (4バイト = 8桁hex) を使う
+    # 先頭64バイト + 長さだけをハッシュ (回答が長くてもO(1)、一意性は time_ns 側で担保)
+    text_bytes = res["response_text"].encode("utf-8")
+    text_hash = hashlib.blake2b(text_bytes[:64] + str(len(text_bytes)).encode(), digest_size=4).hexdigest()
+    task_id = f"{time.time_ns()}_{text_hash}"  # 整数ナノ秒: floatの文字列化をしない
+
+    task_data = {
+        "task_id": task_id,
+        "emotion": res["emotion"],
+        "response_text": res["response_text"],
+        "is_initial_greeting": res.get("is_initial_greeting", False)
+    }
+    if res.get("audio_file"):
+        # 🚀 音声はWorkerが static/audio/ に公開済み → iframeにはURLだけを渡す (Base64をWebSocketに流さない)
+        task_data["audio_file"] = res["audio_file"]
+        task_data["audio_url"] = PathManager.get_static_url(res["audio_file"])
+    else:
+        task_data["audio_b64"] = res.get("audio_b64")
+    return task_data
+
+
+def poll_results(session_id: str) -> bool:
+    """Checks the output queue for finished tasks. Returns True if a new result was found.
+    キューを一括で吸い出してから反映する: progressは最後の1件のみ、ステータスは最後のメッセージで確定。"""
+    ss = st.session_state  # 🚀 session_stateプロキシの属性参照をローカル変数に集約
+    output_queue = ss.output_queue
+    if output_queue.empty():
+        return False  # ほとんどのrerunはここで終わる (空キューのチェック1回のみ)
+
+    results = []
+    last_status = None  # 最後に届いた progress / result / error
+    # 消費者はこのセッションのみ → empty()確認後のget_nowait()は必ず成功する (Empty例外の送出コストなし)
+    while not output_queue.empty():
+        res = output_queue.get_nowait()
+        if res["type"] == "result":
+            results.append(res)
+            last_status = res
+        elif res["type"] in ("progress", "error"):
+            last_status = res
+
+    if last_status is None:
+        return False
+
+    latest = results[-1] if results else None
+    for res in results:
+        # 🚀 複数の結果が溜まっていた場合、アバターに渡すのは最新の1件だけ (古いものは履歴のみ)
+        # 挨拶は保存が必要なので、古くてもタスクを組み立てる
+        if res is latest or res.get("is_initial_greeting"):
+            task_data = _build_avatar_task(res)
+            if res is latest:
+                ss.current_avatar_task = task_data
+                logger.info(f"[App] Updated in-memory task: {task_data['task_id']}")
+
+            if res.get("is_initial_greeting"):
+                # 🚀 書き込みはバックグラウンドでデバウンス (UIスレッドをディスクI/Oでブロックしない)
+                schedule_greeting_cache(task_data)
+
+        ss.history.append({
+            "question": res["question"],
+            "author": res["author"],
+            "response": res["response_text"],
+            "emotion": res["emotion"],
+        })
+
+    if last_status["type"] == "progress":
+        ss.processing = True
+        ss.progress_msg = last_status["msg"]
+    elif last_status["type"] == "result":
+        ss.processing = False
+        ss.progress_msg = "Ready"
+    else:
+        ss.processing = False
+        ss.progress_msg = f"Error: {last_status['msg']}"
+
+    return bool(results)
 
 
 # ============================================================
 # Render Avatar Component
 # ============================================================
+@st.cache_resource
+def _load_avatar_template():
+    """avatar.html をプロセス全体で一度だけ読み込む (app.pyのグローバルはrerun毎に初期化されるため)
+    注入位置 <head> の直後で事前に分割し、(前半, 後半) のタプルで返す。
+    動画URLマップ (不変) は window.AVATAR_VIDEOS として前半に焼き込み済み。"""
+    html_path = LOCAL_STATIC_DIR / "avatar.html"
+    if not html_path.exists():
+        return None
+    html_content = html_path.read_text(encoding="utf-8")
+    split_at = html_content.index("<head>") + len("<head>")
+    videos_json = orjson.dumps(PathManager.get_video_url_map()).decode("utf-8")
+    head = html_content[:split_at] + f"<script>window.AVATAR_VIDEOS = {videos_json};</script>"
+    return head, html_content[split_at:]
+
+
 def render_avatar(session_id: str):
     """Render the avatar directly (NOT inside st.empty) so Streamlit preserves the iframe across reruns."""
     try:
-        html_path = LOCAL_STATIC_DIR / "avatar.html"
-        if html_path.exists():
-            # HTMLテンプレートもモジュールレベルでキャッシュ
-            global _VIDEO_B64_CACHE, _HTML_TEMPLATE_CACHE
-            if _VIDEO_B64_CACHE is None:
-                _VIDEO_B64_CACHE = PathManager.get_video_base64_map()
-            if _HTML_TEMPLATE_CACHE is None:
-                _HTML_TEMPLATE_CACHE = html_path.read_text(encoding="utf-8")
-            
-            video_urls = _VIDEO_B64_CACHE
-            html_content = _HTML_TEMPLATE_CACHE
+        template = _load_avatar_template()
+        if template:
             task_data = st.session_state.get("current_avatar_task")
             
-            # buster = task_id: タスクが変わった時だけHTMLが変わる → iframeが再生成される
+            # タスクが変わった時だけHTMLが変わる → iframeが再生成される
             task_id = task_data.get("task_id", "idle") if task_data else "idle"
-            app_data_json = json.dumps({
-                "video_urls": video_urls,
-                "task": task_data,
-                "sid": session_id,
-                "buster": task_id
-            })
-            
-            injection = f"""
-            <script>
-                window.AVATAR_APP_DATA = {app_data_json};
-            </script>
-            """
-            final_html = html_content.replace("<head>", f"<head>{injection}")
-            
+
+            # 🚀 task_idが前回と同じなら完成済みHTMLをそのまま使い回す (アイドル中のrerunはエンコードも連結もしない)
+            cached_payload = st.session_state.get("_avatar_payload")
+            if cached_payload and cached_payload[0] == task_id:
+                final_html = cached_payload[1]
+            else:
+                # "</" をエスケープ: 回答文に "</script>" が含まれてもscriptタグが途中で閉じない
+                # 🚀 orjson: C実装でjson.dumpsより高速、UTF-8のbytesを直接返す
+                # 動画URLはテンプレート側 (AVATAR_VIDEOS) にあるため、ここでは動的な値だけを直列化
+                app_data_json = orjson.dumps({
+                    "task": task_data,
+                    "sid": session_id
+                }).decode("utf-8").replace("</", "<\\/")
+
+                injection = f"<script>window.AVATAR_APP_DATA = {app_data_json};</script>"
+                # 事前分割済みテンプレートに差し込むだけ (毎回の全文スキャン・置換をしない)
+                head, body = template
+                final_html = head + injection + body
+                st.session_state._avatar_payload = (task_id, final_html)
+
             # ★ 核心: st.empty()を使わず直接描画 → Streamlitがハッシュ比較でiframeを保持
             st.components.v1.html(final_html, height=600, scrolling=False)
         else:
@@ -241,56 +321,36 @@ def render_avatar(session_id: str):
 def main():
     logger.info(f"[App] Starting AI Avatar App (v20.0 Stable)")
     
-    # Initialize Session ID
-    if "session_id" not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())[:8]
-    
     sid = st.session_state.session_id
 
-    if "deployment_done" not in st.session_state:
-        PathManager.ensure_safe_deployment()
-        st.session_state.deployment_done = True
-
-    # 固定5秒ポーリング (動的切り替えはCloudでコンポーネントリセットループを起こすため廃止)
-    st_autorefresh(interval=5000, limit=None, key="auto_refresh")
-
     # Initialize services
-    init_youtube_monitor()
-    init_worker()  # Start the AI-processing background thread
-
-    # Trigger Initial Greeting
-    if "greeting_queued" not in st.session_state:
-        st.session_state.greeting_queued = True
-        
-        # 1. Level 1 (RAM): セッション内キャッシュをチェック
-        if "greeting_task_cache" in st.session_state:
-            st.session_state.current_avatar_task = st.session_state.greeting_task_cache
-            logger.info(f"[Cache] RAM HIT! Serving greeting from session state.")
-        else:
-            # 2. Level 2 (Disk): 物理キャッシュファイルをチェック
-            cache_file = LOCAL_STATIC_DIR / "greeting_cache.json"
-            if cache_file.exists():
-                try:
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        cached_data = json.load(f)
-                    st.session_state.greeting_task_cache = cached_data
-                    st.session_state.current_avatar_task = cached_data
-                    logger.info(f"[Cache] DISK HIT! Loaded greeting from {cache_file.name}")
-                except Exception as e:
-                    logger.warning(f"[Cache] Failed to load disk cache: {e}")
-                    # Fallback to level 3 if load fails
-                    pass
-            
-            # 3. Level 3 (Gemini): どちらもなければ新規生成を依頼
-            if "current_avatar_task" not in st.session_state or st.session_state.current_avatar_task is None:
-                logger.info(f"[Cache] MISS! Queuing initial greeting generation via Gemini.")
-                item = ChatItem(
-                    message_text="与那国島の町民の皆さんに自己紹介と、これからの島への想いを短く話してから、質問を募集してください。",
-                    author_name="システム",
-                    source="system",
-                    is_initial_greeting=True
-                )
-                st.session_state.queue.put(item)
+    # 🚀 スレッドはセッション毎に1回だけ起動 (以降のrerunはフラグ確認1回のみ、secretsも読まない)
+    # プロセス全体で1回にしないのは、キュー/Workerがセッション毎に独立しているため
+    if "_services_started" not in st.session_state:
+        init_youtube_monitor()
+        # 重いAI系モジュール (brain / numpy / langchain) はWorker起動時にだけ読み込む
+        from core_ai_worker import init_worker
+        init_worker()  # Start the AI-processing background thread
+        st.session_state._services_started = True
+
+        # Trigger Initial Greeting (サービス起動と同じ初回rerunで1回だけ)
+        # 1. Level 1 (Process RAM → Disk): プロセス共有キャッシュ経由で物理ファイルを参照 (パースは全体で一度だけ)
+        # セッション毎のコピーは持たない (閉じたタブのsession_stateに挨拶データを残さない)
+        cached_data = _load_greeting_cache(_greeting_cache_mtime())
+        if cached_data:
+            st.session_state.current_avatar_task = cached_data
+            logger.info(f"[Cache] HIT! Serving pre-warmed greeting.")
+
+        # 2. Level 2 (Gemini): なければ新規生成を依頼
+        if st.session_state.current_avatar_task is None:
+            logger.info(f"[Cache] MISS! Queuing initial greeting generation via Gemini.")
+            item = ChatItem(
+                message_text=GREETING_PROMPT,
+                author_name="システム",
+                source="system",
+                is_initial_greeting=True
+            )
+            st.session_state.queue.put(item)
 
     # ポーリング → 結果をsession_stateに反映
     poll_results(sid)
@@ -298,6 +358,20 @@ def main():
     # ★ 核心: st.empty()を使わず直接描画し、iframeの再生成を防ぐ
     render_avatar(sid)
 
+    # --- Result Watcher (Fragmented) ---
+    # 軽量フラグメントがEventだけを確認し、結果が届いた時だけ全体をrerunする
+    # (iframeではなくフラグメントの間隔なので、切り替えてもコンポーネントはリセットされない)
+    is_busy = st.session_state.processing or st.session_state.queue.qsize() > 0
+    watch_interval = RESULT_WATCH_INTERVAL_BUSY if is_busy else RESULT_WATCH_INTERVAL_IDLE
+
+    @st.fragment(run_every=watch_interval)
+    def result_watcher():
+        if st.session_state.result_event.is_set():
+            st.session_state.result_event.clear()
+            st.rerun()
+
+    result_watcher()
+
     # --- Input Area (Fragmented) ---
     @st.fragment
     def chat_area():
@@ -308,7 +382,11 @@ def main():
             else:
                 user_input = st.chat_input("💬 質問を入力 (例: 与那国島の未来について教えてください...)")
 
-                if user_input:
+                if user_input and st.session_state.queue.qsize() >= MAX_PENDING_ITEMS:
+                    # 🚀 入力キューが上限に達している場合は受け付けない (メモリの際限ない増加を防ぐ)
+                    logger.warning(f"[Input] Queue full. Rejected: {user_input[:20]}")
+                    st.toast("混雑中です。少し待って再送信してください")
+                elif user_input:
                     logger.info(f"[Input] User submitted: {user_input[:20]}")
                     
                     # 🚀 連続送信防ぐため即座にprocessingをTrueにし、ロック
@@ -332,21 +410,30 @@ def main():
     # --- Status and History Area (Bottom) ---
     st.markdown("---")
     st.header("📜 応答履歴とステータス")
-    if st.session_state.processing:
-        q_size = st.session_state.queue.qsize()
-        if q_size > 0:
-            st.warning(f"現在、他の町民の方の質問に回答中です。（あと {q_size} 人待ち）")
-        
-        st.info(f"AI阪口源太が考え中... ({st.session_state.progress_msg})")
-        if st.button("強制リセット (停止した場合)", key="history_force_reset"):
-            st.session_state.processing = False
-            st.session_state.progress_msg = "Reset"
-            st.session_state.queue = Queue()
-            st.session_state.output_queue = Queue()
-            st.toast("処理をリセットしました")
-            st.components.v1.html("<script>localStorage.clear(); window.parent.location.reload();</script>", height=0)
-            st.rerun()
-            
+
+    # --- Status (Fragmented) ---
+    # リセットボタンのクリックはこのフラグメントだけを再実行する (リセット時は st.rerun() で全体を更新)
+    @st.fragment
+    def status_area():
+        if st.session_state.processing:
+            q_size = st.session_state.queue.qsize()
+            if q_size > 0:
+                st.warning(f"現在、他の町民の方の質問に回答中です。（あと {q_size} 人待ち）")
+
+            st.info(f"AI阪口源太が考え中... ({st.session_state.progress_msg})")
+            if st.button("強制リセット (停止した場合)", key="history_force_reset"):
+                st.session_state.processing = False
+                st.session_state.progress_msg = "Reset"
+                # 🚀 新しいキューに差し替えず中身だけを捨てる (Workerは起動時のキューを参照し続けるため)
+                _drain_queue(st.session_state.queue)
+                _drain_queue(st.session_state.output_queue)
+                st.session_state.result_event.clear()
+                st.toast("処理をリセットしました")
+                st.components.v1.html("<script>localStorage.clear(); window.parent.location.reload();</script>", height=0)
+                st.rerun()
+
+    status_area()
+
     if st.session_state.history:
         for entry in reversed(st.session_state.history):
             st.markdown(
@@ -359,14 +446,12 @@ def main():
     st.markdown("---")
     st.write("💬 **AIで解決しないご質問や、ソースコードはこちら！**")
     
+    avatar_name, x_url, repo_url = _contact_settings()
     col1, col2 = st.columns(2)
     with col1:
-        avatar_name = st.secrets.get("AVATAR_NAME", "阪口源太")
-        x_url = st.secrets.get("SOCIAL_X_URL", "https://x.com/genta2223")
         st.link_button(f"🐦 X (旧Twitter) で{avatar_name}に直接質問する", x_url, use_container_width=True)
 
     with col2:
-        repo_url = st.secrets.get("GITHUB_REPO_URL", "https://github.com/genta2223/ai-sakguchi")
         st.link_button("💻 GitHubでソースコードを見る (OSS)", repo_url, use_container_width=True)
 
 
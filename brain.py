@@ -2,19 +2,16 @@
 brain.py — Gemini AI Response + FAISS RAG for Streamlit Cloud
 Adapted from gpt.py + get_faiss_vector.py (MeCab/BM25 removed for cloud compatibility).
 """
+import functools
 import json
 import logging
 import os
 import re
 from pathlib import Path
 
-from google import genai
-from google.genai import types
-
-import pandas as pd
 import streamlit as st
-from langchain_community.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+# 🚀 google.genai / langchain / pandas は起動を重くするため、使う関数の中で遅延インポートする
 
 logger = logging.getLogger(__name__)
 
@@ -47,38 +44,66 @@ def _configure_genai(api_key: str = None):
             pass
 
 
+@functools.lru_cache(maxsize=4)
+def _get_genai_client(api_key: str):
+    """genai.Client をAPIキー毎に使い回す (HTTP接続プール・認証の再構築を毎回行わない)
+    Workerスレッドからも呼ばれるため lru_cache を使う。キーが変われば新しいクライアントになる。"""
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_ng_rules() -> tuple[tuple[str, str], ...]:
+    """NG.csv を一度だけ読み込み、(小文字化したNGワード, 返答) の組にしておく
+    🚀 Workerスレッドからも呼ばれるため st.cache_resource ではなく lru_cache を使う"""
+    if not NG_CSV_PATH.exists():
+        return ()
+    import pandas as pd
+    ng_df = pd.read_csv(NG_CSV_PATH, dtype=str, keep_default_na=False)
+    return tuple(
+        (ng.lower(), reply or DEFAULT_NG_MESSAGE)
+        for ng, reply in zip(ng_df["ng"], ng_df["reply"])
+        if ng
+    )
+
+
 def check_ng(text: str) -> tuple[bool, str]:
     """NGワードチェック"""
-    if not NG_CSV_PATH.exists():
+    ng_rules = _load_ng_rules()
+    if not ng_rules:
         return False, ""
-    ng_df = pd.read_csv(NG_CSV_PATH)
     if "核家族" in text or "中核" in text or "核心" in text:
         return False, ""
-    for row in ng_df.to_dict(orient="records"):
-        ng = row.pop("ng")
-        reply = str(row.pop("reply"))
-        if ng.lower() in text.lower():
-            if reply == "nan" or not reply:
-                return True, DEFAULT_NG_MESSAGE
-            else:
-                return True, reply
+    text_lower = text.lower()
+    for ng, reply in ng_rules:
+        if ng in text_lower:
+            return True, reply
     return False, ""
 
 
+@functools.lru_cache(maxsize=4)
+def _get_embeddings(api_key: str):
+    """埋め込みクライアントをAPIキー毎に使い回す (QA/ナレッジの両インデックスは同じモデルで構築済み)
+    Workerスレッドからも呼ばれるため lru_cache を使う。"""
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    return GoogleGenerativeAIEmbeddings(
+        model="models/gemini-embedding-001",
+        google_api_key=api_key # 迷わずこれを渡す
+    )
+
+
 def _load_faiss_qa_internal(api_key: str = None):
     """Actual loading of FAISS QA index."""
+    from langchain_community.vectorstores import FAISS
+
     logger.info("[Brain] Loading FAISS QA index...")
     _configure_genai(api_key)
     
     # 🚀 Secretsから直接、かつ引数を最優先で取得
     target_key = api_key or st.secrets.get("FINAL_MASTER_KEY")
     
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/gemini-embedding-001",
-        google_api_key=target_key # 迷わずこれを渡す
-    )
     vector = FAISS.load_local(
-        str(FAISS_QA_DB_DIR), embeddings, allow_dangerous_deserialization=True
+        str(FAISS_QA_DB_DIR), _get_embeddings(target_key), allow_dangerous_deserialization=True
     )
     logger.info("[Brain] FAISS QA index loaded.")
     return vector
@@ -90,18 +115,16 @@ def _load_faiss_qa_cached():
 
 def _load_faiss_knowledge_internal(api_key: str = None):
     """Actual loading of FAISS Knowledge index."""
+    from langchain_community.vectorstores import FAISS
+
     logger.info("[Brain] Loading FAISS Knowledge index...")
     _configure_genai(api_key)
     
     # 🚀 Secretsから直接、かつ引数を最優先で取得
     target_key = api_key or st.secrets.get("FINAL_MASTER_KEY")
     
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/gemini-embedding-001",
-        google_api_key=target_key # 迷わずこれを渡す
-    )
     vector = FAISS.load_local(
-        str(FAISS_KNOWLEDGE_DB_DIR), embeddings, allow_dangerous_deserialization=True
+        str(FAISS_KNOWLEDGE_DB_DIR), _get_embeddings(target_key), allow_dangerous_deserialization=True
     )
     logger.info("[Brain] FAISS Knowledge index loaded.")
     return vector
@@ -112,17 +135,33 @@ def _load_faiss_knowledge_cached():
     return _load_faiss_knowledge_internal(os.environ.get("GOOGLE_API_KEY"))
 
 
-def get_multiple_qa(query: str, top_k: int = 5, api_key: str = None, use_cache: bool = True) -> list[str]:
-    """回答例を取得する (FAISS only)."""
+def _get_qa_vector(api_key: str = None, use_cache: bool = True):
+    if use_cache:
+        return _load_faiss_qa_cached()
+    return _load_faiss_qa_internal(api_key)
+
+
+def _get_knowledge_vector(api_key: str = None, use_cache: bool = True):
+    if use_cache:
+        return _load_faiss_knowledge_cached()
+    return _load_faiss_knowledge_internal(api_key)
+
+
+def embed_query(query: str, api_key: str = None) -> list[float]:
+    """質問文を一度だけベクトル化する (インデックスを読み込まず、共有の埋め込みクライアントで直接計算)"""
+    _configure_genai(api_key)
+    return _get_embeddings(api_key or st.secrets.get("FINAL_MASTER_KEY")).embed_query(query)
+
+
+def get_multiple_qa(query: str, top_k: int = 5, api_key: str = None, use_cache: bool = True,
+                    query_vector: list[float] = None) -> list[str]:
+    """回答例を取得する (FAISS only). query_vector を渡すと埋め込みAPI呼び出しを省略する。"""
     try:
         logger.info(f"[Brain] Retrieving QA matches for: {query[:20]}...")
-        if use_cache:
-            vector = _load_faiss_qa_cached()
-        else:
-            vector = _load_faiss_qa_internal(api_key)
-            
-        retriever = vector.as_retriever(search_kwargs={"k": top_k})
-        context_docs = retriever.invoke(query)
+        vector = _get_qa_vector(api_key, use_cache)
+        if query_vector is None:
+            query_vector = vector.embeddings.embed_query(query)
+        context_docs = vector.similarity_search_by_vector(query_vector, k=top_k)
         logger.info(f"[Brain] QA Retrieval done: {len(context_docs)} matches.")
         return [doc.page_content for doc in context_docs[:top_k]]
     except Exception as e:
@@ -130,17 +169,15 @@ def get_multiple_qa(query: str, top_k: int = 5, api_key: str = None, use_cache:
         return []
 
 
-def get_multiple_knowledge(query: str, top_k: int = 5, api_key: str = None, use_cache: bool = True) -> list[tuple[str, dict]]:
-    """RAGナレッジを取得する (FAISS only)."""
+def get_multiple_knowledge(query: str, top_k: int = 5, api_key: str = None, use_cache: bool = True,
+                           query_vector: list[float] = None) -> list[tuple[str, dict]]:
+    """RAGナレッジを取得する (FAISS only). query_vector を渡すと埋め込みAPI呼び出しを省略する。"""
     try:
         logger.info(f"[Brain] Retrieving Knowledge matches for: {query[:20]}...")
-        if use_cache:
-            vector = _load_faiss_knowledge_cached()
-        else:
-            vector = _load_faiss_knowledge_internal(api_key)
-            
-        retriever = vector.as_retriever(search_kwargs={"k": top_k})
-        context_docs = retriever.invoke(query)
+        vector = _get_knowledge_vector(api_key, use_cache)
+        if query_vector is None:
+            query_vector = vector.embeddings.embed_query(query)
+        context_docs = vector.similarity_search_by_vector(query_vector, k=top_k)
         logger.info(f"[Brain] Knowledge Retrieval done: {len(context_docs)} matches.")
         return [(doc.page_content, doc.metadata) for doc in context_docs[:top_k]]
     except Exception as e:
@@ -151,10 +188,16 @@ def get_multiple_knowledge(query: str, top_k: int = 5, api_key: str = None, use_
 def _build_system_prompt(query: str, api_key: str = None, use_cache: bool = True) -> str:
     """システムプロンプトを構築する (RAG付き)."""
     logger.info("[Brain] Building system prompt...")
-    rag_qa_list = get_multiple_qa(query=query, top_k=5, api_key=api_key, use_cache=use_cache)
+    # 🚀 埋め込みAPIは1回だけ呼び、同じベクトルで両インデックスを検索する
+    try:
+        query_vector = embed_query(query, api_key=api_key)
+    except Exception as e:
+        logger.warning(f"[Brain] Query embedding failed: {e}")
+        query_vector = None  # 各検索側で個別に再試行・フォールバックさせる
+    rag_qa_list = get_multiple_qa(query=query, top_k=5, api_key=api_key, use_cache=use_cache, query_vector=query_vector)
     rag_qa = "\n".join(rag_qa_list)
     
-    rag_knowledges = get_multiple_knowledge(query=query, top_k=5, api_key=api_key, use_cache=use_cache)
+    rag_knowledges = get_multiple_knowledge(query=query, top_k=5, api_key=api_key, use_cache=use_cache, query_vector=query_vector)
     rag_knowledge = "\n".join([f"---\n{k}" for k, _ in rag_knowledges])
 
     system_prompt = f"""あなたは与那国町議会議員の阪口源太（さかぐちげんた）としてYoutube上でコメントに返信するAITuberです。
@@ -228,7 +271,7 @@ def generate_response(text: str, api_key: str = None, use_cache: bool = True) ->
     system_prompt = _build_system_prompt(text, api_key=api_key, use_cache=use_cache)
     messages = system_prompt + "\n" + text
 
-    client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+    client = _get_genai_client(os.environ.get("GOOGLE_API_KEY"))
 
     # 動的に検索を使うかどうか判定
     policy_keywords = ["与那国馬", "馬", "医療", "病院", "教育", "学校", "保育", "子育て", "税", "防衛", "自衛隊", "町政", "議員", "選挙", "観光", "交通", "フェリー", "空港", "産業", "農業", "漁業", "IT", "DX", "移住", "人口"]
@@ -309,7 +352,9 @@ def filter_inappropriate_comments(comments: list[str]) -> list[str]:
 解析したい質問の配列は以下です。
 {comments}
 """
-    client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+    from google.genai import types
+
+    client = _get_genai_client(os.environ.get("GOOGLE_API_KEY"))
     response = client.models.generate_content(
         model="gemini-2.0-flash",
         contents=prompt,
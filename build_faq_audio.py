@@ -55,7 +55,7 @@ def build_faq_audio():
     
     if updates_made > 0:
         with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(faq_cache, f, ensure_ascii=False, indent=2)
+            json.dump(faq_cache, f, ensure_ascii=False, separators=(',', ':'))  # 実行時に読むファイルなのでコンパクトに
         logger.info(f"Updated {updates_made} items with audio and saved to {cache_file.name}")
     else:
         logger.info("No missing audio found, zero updates made.")
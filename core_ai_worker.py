@@ -1,23 +1,43 @@
+import atexit
 import logging
 import os
 import time
 import threading
-import json
+import orjson
 import numpy as np
-from queue import Queue, Empty
+from queue import SimpleQueue, Empty
 
 import re
 import streamlit as st
 from brain import generate_response
 from tts import synthesize_speech
 from core_paths import LOCAL_STATIC_DIR
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from core_cache import _atomic_write_bytes, publish_audio, is_audio_published
+
+# 全角半角空白、改行、感嘆符などを全て除去 (インポート時に一度だけコンパイル)
+_NORMALIZE_RE = re.compile(r'[…\.\?\!。？！\s\n\r　]+')
 
 def normalize_text(text: str) -> str:
     """文字列の正規化：不要な記号や空白を削除（キャッシュの柔軟な照合用）"""
     if not text: return ""
-    # 全角半角空白、改行、感嘆符などを全て除去
-    return re.sub(r'[…\.\?\!。？！\s\n\r　]+', '', text).strip()
+    # \s で空白は全て除去済みなので strip() は不要
+    return _NORMALIZE_RE.sub('', text)
+
+def _unit_rows(vectors) -> np.ndarray:
+    """埋め込みを float32 の単位ベクトルにする。正規化済み同士ならコサイン類似度は内積1回で求まる"""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+def _audio_fields(audio_b64: str) -> dict:
+    """音声を static/audio/ に公開し、結果にはパスだけを載せる (失敗時は従来どおりBase64で渡す)"""
+    if not audio_b64:
+        return {"audio_b64": audio_b64}
+    try:
+        return {"audio_file": publish_audio(audio_b64)}
+    except Exception as e:
+        logger.warning(f"[Worker] Failed to publish audio, falling back to base64: {e}")
+        return {"audio_b64": audio_b64}
 
 # ============================================================
 # Configuration & Worker
@@ -29,73 +49,168 @@ IS_CLOUD = os.getenv("STREAMLIT_SERVER_BASE_URL", "") != ""
 MAX_CONCURRENCY = 10 if IS_CLOUD else 3
 SEMAPHORE = threading.Semaphore(MAX_CONCURRENCY)
 
+FAQ_CACHE_FILE = LOCAL_STATIC_DIR / "faq_cache.json"      # 第1層 (マスター・読み取り専用)
+EXTRA_CACHE_FILE = LOCAL_STATIC_DIR / "extra_cache.json"  # 第2層 (野良質問の追記先)
+
 FAQ_CACHE = []
-FAQ_EMBEDDINGS = None
+FAQ_INDEX = {}  # norm_key → FAQ_CACHE内の位置 (完全一致チェックをO(1)で行う)
+FAQ_EMBEDDINGS = None  # 単位ベクトル化済み (行ごとにL2正規化) の質問埋め込み行列
 EMBEDDER = None
+# キャッシュしてはいけない「回答拒否」系の文言 (ヒット判定と追記判定で共用)
+REJECTION_PHRASES = ("答えられません", "学習中", "エラー", "申し訳ありません")
+EXTRA_CACHE_WRITE_LOCK = threading.Lock()  # 複数の書き込みスレッドが同じ一時ファイルを奪い合わないように
+EXTRA_CACHE_FLUSH_DELAY = 5  # seconds: 連続した追記・修復をまとめて1回の書き込みにする待ち時間
+
+# 🚀 FAQ読込・ベクトル化はプロセスで一度だけ (セッション毎のWorkerが同時起動しても重複させない)
+# ロックは FAQ_CACHE / FAQ_INDEX / FAQ_EMBEDDINGS の更新 (読込・追記) だけを守り、埋め込みAPI (ネットワーク) 呼び出し中は保持しない
+FAQ_INIT_LOCK = threading.Lock()
+EMBED_RETRY_INTERVAL = 300  # seconds: 埋め込みの事前計算に失敗したら、この間は再試行しない
+
+_embedding_in_progress = False
+_embedding_failed_at = 0.0
+
+_extra_cache_dirty = threading.Event()
+_extra_flusher_lock = threading.Lock()
+_extra_flusher_started = False
 
 def init_faq_cache(api_key: str):
-    global FAQ_CACHE, FAQ_EMBEDDINGS, EMBEDDER
-    if FAQ_CACHE: return
-    
-    FAQ_CACHE = []
+    """FAQキャッシュの読み込みと埋め込みの事前計算 (プロセスで一度だけ)。
+    埋め込みは他のWorkerが計算中・失敗直後なら待たずに戻る (それまでは完全一致のみで応答する)。"""
+    global FAQ_EMBEDDINGS, EMBEDDER, _embedding_in_progress, _embedding_failed_at
+    if EMBEDDER is not None: return
+    with FAQ_INIT_LOCK:
+        if not FAQ_CACHE:
+            _load_faq_cache()
+        if not FAQ_CACHE or EMBEDDER is not None or _embedding_in_progress:
+            return  # 他セッションのWorkerが完了済み、または計算中
+        if time.time() - _embedding_failed_at < EMBED_RETRY_INTERVAL:
+            return
+        _embedding_in_progress = True
+        questions = [item.get("question", "") for item in FAQ_CACHE]
+
+    embeddings = None
+    try:
+        # 🚀 langchain / google-genai は重いため、実際に埋め込みを計算する時だけインポートする
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        embedder = GoogleGenerativeAIEmbeddings(
+            model="models/gemini-embedding-001",
+            google_api_key=api_key
+        )
+        asked = [i for i, q in enumerate(questions) if q]
+        if asked:
+            vectors = _unit_rows(embedder.embed_documents([questions[i] for i in asked]))
+            # 行番号 = FAQ_CACHE内の位置 に揃える (質問のない項目はゼロ行 = 類似度0で当たらない)
+            embeddings = np.zeros((len(questions), vectors.shape[1]), dtype=np.float32)
+            embeddings[asked] = vectors
+        else:
+            embeddings = np.array([])
+    except Exception as e:
+        logger.warning(f"[Worker] FAQ embedding warm-up failed, retrying in {EMBED_RETRY_INTERVAL}s: {e}")
+
+    with FAQ_INIT_LOCK:
+        _embedding_in_progress = False
+        if embeddings is None:
+            _embedding_failed_at = time.time()
+            return
+        if len(embeddings) and len(FAQ_CACHE) > len(embeddings):
+            # 計算中に追記された質問はゼロ行で埋めて位置を揃える (完全一致では引き続きヒットする)
+            padding = np.zeros((len(FAQ_CACHE) - len(embeddings), embeddings.shape[1]), dtype=np.float32)
+            embeddings = np.vstack([embeddings, padding])
+        FAQ_EMBEDDINGS = embeddings
+        EMBEDDER = embedder
+
+
+def _load_faq_cache():
+    """マスター/エキストラのJSONを読み込み、照合用インデックスを構築する (FAQ_INIT_LOCK下で呼ぶ)"""
+    global FAQ_CACHE, FAQ_INDEX
+    # 完成してから公開する: 読み込み途中のリストを他スレッドに見せない
+    faq_cache = []
+    faq_index = {}
     
-    # 1. 第1層（聖域）マスターキャッシュの読み込み（読み取り専用）
-    cache_file = LOCAL_STATIC_DIR / "faq_cache.json"
-    if cache_file.exists():
+    # 第1層（聖域）マスター (読み取り専用) → 第2層（野良質問拡張）エキストラ の順に読み込む
+    for source, path in (("master", FAQ_CACHE_FILE), ("extra", EXTRA_CACHE_FILE)):
+        if not path.exists():
+            continue
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                master_cache = json.load(f)
-                for item in master_cache:
-                    item["source"] = "master" # マークづけ
-                FAQ_CACHE.extend(master_cache)
+            # 🚀 orjsonで数MBのJSONを高速パース (bytesのまま渡し、テキストデコードを挟まない)
+            items = orjson.loads(path.read_bytes())
+            for item in items:
+                item["source"] = source # マークづけ
+            faq_cache.extend(items)
+            logger.info(f"[Worker] Loaded {len(items)} {source} FAQs.")
         except Exception as e:
-            logger.error(f"[Worker] Failed to load master cache: {e}")
+            logger.error(f"[Worker] Failed to load {source} cache: {e}")
 
-    # 2. 第2層（野良質問拡張）エキストラキャッシュの読み込み
-    extra_cache_file = LOCAL_STATIC_DIR / "extra_cache.json"
-    if extra_cache_file.exists():
-        try:
-            with open(extra_cache_file, "r", encoding="utf-8") as f:
-                extra_cache = json.load(f)
-                for item in extra_cache:
-                    item["source"] = "extra"
-                FAQ_CACHE.extend(extra_cache)
-            logger.info(f"[Worker] Loaded {len(extra_cache)} extra FAQs.")
-        except Exception as e:
-            logger.error(f"[Worker] Failed to load extra cache: {e}")
-            
     try:
         # 照合用キーを事前に準備
-        for c_item in FAQ_CACHE:
+        for i, c_item in enumerate(faq_cache):
             if "question" in c_item:
                 c_item["norm_key"] = normalize_text(c_item["question"])
+                faq_index.setdefault(c_item["norm_key"], i)  # 重複時は先頭 (マスター優先)
                 
         # 🚀 ベクトル化（重い処理）はここでは行わず、_worker_loop内でLazy Load（遅延実行）するよう変更
-        logger.info(f"[Worker] Loaded total {len(FAQ_CACHE)} FAQs. Embeddings will be lazy-loaded on first miss.")
+        logger.info(f"[Worker] Loaded total {len(faq_cache)} FAQs. Embeddings will be lazy-loaded on first miss.")
     except Exception as e:
         logger.error(f"[Worker] Failed to init FAQ cache normalization: {e}")
 
-def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.Event, 
+    FAQ_INDEX = faq_index
+    FAQ_CACHE = faq_cache
+
+def _write_extra_cache():
+    """マスター以外 (source == "extra") のキャッシュを extra_cache.json へ書き出す"""
+    with EXTRA_CACHE_WRITE_LOCK:
+        # 書き出し開始前に下ろす: スナップショット後の変更は再度dirtyになり、次の周期で書かれる
+        _extra_cache_dirty.clear()
+        try:
+            save_data = []
+            for c in FAQ_CACHE:
+                if c.get("source") == "extra":
+                    c_copy = c.copy()
+                    c_copy.pop("norm_key", None)
+                    c_copy.pop("audio_file", None)  # 公開パスはプロセス内だけのメモ
+                    # マークづけは永続化する必要ないかもだが、読み込み時につけるので残してよし
+                    save_data.append(c_copy)
+
+            # 🚀 orjsonでbytesを直接生成 (indent無し)、一時ファイル→os.replaceで原子的に差し替え
+            _atomic_write_bytes(EXTRA_CACHE_FILE, orjson.dumps(save_data))
+            logger.info(f"💾 [Worker] Safely saved extra_cache.json async. Extra total: {len(save_data)}")
+        except Exception as e:
+            logger.error(f"Failed to write extra cache back to disk: {e}")
+
+
+def _flush_extra_cache():
+    """未書き込みの変更があれば書き出す (atexit用)"""
+    if _extra_cache_dirty.is_set():
+        _write_extra_cache()
+
+
+def _extra_flush_loop():
+    while True:
+        _extra_cache_dirty.wait()
+        time.sleep(EXTRA_CACHE_FLUSH_DELAY)  # この間の追記・修復は1回の書き込みにまとまる
+        _write_extra_cache()
+
+
+def _schedule_extra_cache_write():
+    """extra_cache.json の書き込みを予約する (即座に戻る)。フラッシャースレッドはプロセスで1つだけ。"""
+    global _extra_flusher_started
+    _extra_cache_dirty.set()
+    if not _extra_flusher_started:
+        with _extra_flusher_lock:
+            if not _extra_flusher_started:
+                threading.Thread(target=_extra_flush_loop, daemon=True, name="extra-cache-flusher").start()
+                atexit.register(_flush_extra_cache)
+                _extra_flusher_started = True
+
+
+def _worker_loop(input_queue: SimpleQueue, output_queue: SimpleQueue, result_event: threading.Event, stop_event: threading.Event, 
                  google_api_key: str, creds_json: str, private_key: str, client_email: str):
-    """Background thread: Process Gemini and TTS with explicitly injected secrets."""
-    global FAQ_CACHE, FAQ_EMBEDDINGS, EMBEDDER
+    """Background thread: Process Gemini and TTS with explicitly injected secrets.
+    結果/エラーをoutput_queueへ積んだら result_event をセットし、UI側のウォッチャーへ即座に通知する。"""
+    global FAQ_EMBEDDINGS
     logger.info("[Worker] Thread started with injected secrets (Bucket Relay).")
     # 🌟 Silent Pre-load: 起動直後のバックグラウンドスレッドで重い処理を静かに完了させる
     init_faq_cache(google_api_key)
-    if FAQ_CACHE and EMBEDDER is None:
-        try:
-            EMBEDDER = GoogleGenerativeAIEmbeddings(
-                model="models/gemini-embedding-001",
-                google_api_key=google_api_key
-            )
-            questions = [item.get("question", "") for item in FAQ_CACHE if item.get("question")]
-            if questions:
-                embeddings = EMBEDDER.embed_documents(questions)
-                FAQ_EMBEDDINGS = np.array(embeddings)
-            else:
-                FAQ_EMBEDDINGS = np.array([])
-        except Exception:
-            pass # Silent fail to avoid polluting WebSocket with logs
     while not stop_event.is_set():
         try:
             item = input_queue.get(timeout=1)
@@ -110,6 +225,7 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                 is_greeting = getattr(item, "is_initial_greeting", False)
                 
                 cache_to_repair = None
+                query_embed = None  # ベクトル検索で得た質問の埋め込み (追記時に再利用)
                 
                 if FAQ_CACHE and not is_system and not is_greeting:
                     try:
@@ -117,22 +233,19 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                         best_idx = -1
                         max_sim = 0.0
                         
-                        # 1. まずは正規化文字列で完全一致チェック (EMBEDDINGS不要のレガシーパス)
-                        for i, cache_item in enumerate(FAQ_CACHE):
-                            if cache_item.get("norm_key") == norm_query:
-                                logger.info(f"[Cache Debug] ⚡ EXACT MATCH HIT! (正規化キー完全一致)")
-                                best_idx = i
-                                max_sim = 1.0
-                                break
+                        # 1. まずは正規化文字列で完全一致チェック (EMBEDDINGS不要のレガシーパス、辞書引きでO(1))
+                        exact_idx = FAQ_INDEX.get(norm_query)
+                        if exact_idx is not None:
+                            logger.info(f"[Cache Debug] ⚡ EXACT MATCH HIT! (正規化キー完全一致)")
+                            best_idx = exact_idx
+                            max_sim = 1.0
                         
                         # 2. 完全一致しなかった場合はベクトル検索
                         if best_idx == -1 and EMBEDDER is not None and FAQ_EMBEDDINGS is not None and len(FAQ_EMBEDDINGS) > 0:
                             try:
                                 query_embed = EMBEDDER.embed_query(item.message_text)
-                                query_vector = np.array(query_embed)
-                                
-                                norms = np.linalg.norm(FAQ_EMBEDDINGS, axis=1) * np.linalg.norm(query_vector)
-                                similarities = np.dot(FAQ_EMBEDDINGS, query_vector) / norms
+                                # 🚀 FAQ側は事前に正規化済み: 毎回N行分のノルムを計算せず、行列×ベクトル1回で済ませる
+                                similarities = FAQ_EMBEDDINGS @ _unit_rows(query_embed)[0]
                                 
                                 best_idx = int(np.argmax(similarities))
                                 max_sim = float(similarities[best_idx])
@@ -142,8 +255,7 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                         
                         if max_sim >= 0.81 and best_idx != -1:
                             cached_ans = FAQ_CACHE[best_idx].get("response_text", "")
-                            rejection_phrases = ["答えられません", "学習中", "エラー", "申し訳ありません"]
-                            is_rejected = any(rp in cached_ans for rp in rejection_phrases)
+                            is_rejected = any(rp in cached_ans for rp in REJECTION_PHRASES)
                             
                             if is_rejected:
                                 logger.info(f"[Worker] ⚠️ Cache contains rejection phrase. Invalidating and flagging for auto-repair. (Idx: {best_idx})")
@@ -161,17 +273,24 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                     reply_text = best_match_item["response_text"]
                     emotion = best_match_item.get("emotion", "Neutral")
                     audio_b64 = best_match_item.get("audio_b64", "")
-                    
-                    # 音声がキャッシュにない場合はTTSで生成 (faq_cache.jsonは音声を含まないエントリがある)
-                    if not audio_b64:
-                        logger.info("[Worker] FAQ Cache has no audio. Generating TTS...")
-                        audio_b64 = synthesize_speech(reply_text, creds_json=creds_json, 
-                                                    private_key=private_key, client_email=client_email, 
-                                                    use_cache=False)
+                    # 🚀 公開済み音声のパスをFAQ項目に覚えておき、2回目以降はデコード・ハッシュ・TTSを丸ごと省く
+                    audio_file = best_match_item.get("audio_file")
+                    if audio_file and is_audio_published(audio_file):
+                        audio_fields = {"audio_file": audio_file}
+                    else:
+                        # 音声がキャッシュにない場合はTTSで生成 (faq_cache.jsonは音声を含まないエントリがある)
+                        if not audio_b64:
+                            logger.info("[Worker] FAQ Cache has no audio. Generating TTS...")
+                            audio_b64 = synthesize_speech(reply_text, creds_json=creds_json, 
+                                                        private_key=private_key, client_email=client_email, 
+                                                        use_cache=False)
+                        audio_fields = _audio_fields(audio_b64)
+                        if "audio_file" in audio_fields:
+                            best_match_item["audio_file"] = audio_fields["audio_file"]
                     
                     result = {
                         "type": "result",
-                        "audio_b64": audio_b64,
+                        **audio_fields,
                         "emotion": emotion,
                         "response_text": reply_text,
                         "question": item.message_text if not is_system else "(起動挨拶)",
@@ -179,78 +298,25 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                         "is_initial_greeting": getattr(item, "is_initial_greeting", False)
                     }
                     output_queue.put(result)
+                    result_event.set()
                     logger.info(f"[Worker] Task complete (FAQ Cache){' - TTS SKIPPED 🚀' if best_match_item.get('audio_b64') else ''}")
                     continue
                 
                 # 2. AI Response
                 reply_text, emotion = generate_response(item.message_text, api_key=google_api_key, use_cache=False)
-                output_queue.put({"type": "debug", "msg": f"🤖 思考プロセス: LLM回答生成完了 ({len(reply_text)}文字, 感情:{emotion})"})
+                # debugメッセージはUI側で捨てられるだけなのでキューに積まずログへ
+                logger.debug(f"[Worker] 🤖 思考プロセス: LLM回答生成完了 ({len(reply_text)}文字, 感情:{emotion})")
                 
                 # 2. TTS
-                output_queue.put({"type": "debug", "msg": "🎤 思考プロセス: 音声合成をリクエスト中..."})
+                logger.debug("[Worker] 🎤 思考プロセス: 音声合成をリクエスト中...")
                 audio_b64 = synthesize_speech(reply_text, creds_json=creds_json, 
                                             private_key=private_key, client_email=client_email, 
                                             use_cache=False)
                 
-                # 3. Auto-Repair or Append Cache if needed
-                is_valid_answer = True
-                rejection_phrases = ["答えられません", "学習中", "エラー", "申し訳ありません"]
-                if any(rp in reply_text for rp in rejection_phrases):
-                    is_valid_answer = False
-
-                if not is_system and not is_greeting and is_valid_answer:
-                    if cache_to_repair is not None and FAQ_CACHE[cache_to_repair].get("source") != "master":
-                        # レガシー(マスター)以外なら修復
-                        logger.info(f"🔧 [Worker] Auto-repairing EXTRA cache index {cache_to_repair} with new valid answer.")
-                        FAQ_CACHE[cache_to_repair]["response_text"] = reply_text
-                        FAQ_CACHE[cache_to_repair]["emotion"] = emotion
-                        FAQ_CACHE[cache_to_repair]["audio_b64"] = audio_b64
-                    elif cache_to_repair is None:
-                        logger.info(f"➕ [Worker] Appending new wild question to extra cache.")
-                        new_cache_entry = {
-                            "question": item.message_text,
-                            "response_text": reply_text,
-                            "emotion": emotion,
-                            "audio_b64": audio_b64,
-                            "norm_key": normalize_text(item.message_text),
-                            "source": "extra"
-                        }
-                        FAQ_CACHE.append(new_cache_entry)
-                        try:
-                            if EMBEDDER is not None:
-                                new_embed = np.array([EMBEDDER.embed_query(item.message_text)])
-                                if FAQ_EMBEDDINGS is not None:
-                                    FAQ_EMBEDDINGS = np.vstack([FAQ_EMBEDDINGS, new_embed])
-                                else:
-                                    FAQ_EMBEDDINGS = new_embed
-                        except Exception as e:
-                            logger.error(f"Failed to update embeddings dynamically: {e}")
-                    
-                    # 🚀 非同期で書き込みを行い、応答プロセスをブロックしない
-                    def async_write_extra_cache():
-                        try:
-                            # マスター以外のキャッシュを抽出 (source == "extra")
-                            save_data = []
-                            for c in FAQ_CACHE:
-                                if c.get("source") == "extra":
-                                    c_copy = c.copy()
-                                    c_copy.pop("norm_key", None)
-                                    # マークづけは永続化する必要ないかもだが、読み込み時につけるので残してよし
-                                    save_data.append(c_copy)
-                            
-                            extra_cache_file = LOCAL_STATIC_DIR / "extra_cache.json"
-                            with open(extra_cache_file, "w", encoding="utf-8") as f:
-                                json.dump(save_data, f, ensure_ascii=False, indent=2)
-                            logger.info(f"💾 [Worker] Safely saved extra_cache.json async. Extra total: {len(save_data)}")
-                        except Exception as e:
-                            logger.error(f"Failed to write extra cache back to disk: {e}")
-                            
-                    threading.Thread(target=async_write_extra_cache, daemon=True).start()
-
-                # 4. Final Result
+                # 3. Final Result (🚀 キャッシュ更新より先に返し、UIを待たせない)
                 result = {
                     "type": "result",
-                    "audio_b64": audio_b64,
+                    **_audio_fields(audio_b64),
                     "emotion": emotion,
                     "response_text": reply_text,
                     "question": item.message_text if not is_system else "(起動挨拶)",
@@ -258,11 +324,60 @@ def _worker_loop(input_queue: Queue, output_queue: Queue, stop_event: threading.
                     "is_initial_greeting": getattr(item, "is_initial_greeting", False)
                 }
                 output_queue.put(result)
+                result_event.set()
                 logger.info(f"[Worker] Task complete: {reply_text[:20]}...")
 
+                # 4. Auto-Repair or Append Cache if needed (回答は送信済み: ここでの失敗はログのみでUIにエラーを出さない)
+                try:
+                    is_valid_answer = True
+                    if any(rp in reply_text for rp in REJECTION_PHRASES):
+                        is_valid_answer = False
+
+                    if not is_system and not is_greeting and is_valid_answer:
+                        if cache_to_repair is not None and FAQ_CACHE[cache_to_repair].get("source") != "master":
+                            # レガシー(マスター)以外なら修復
+                            logger.info(f"🔧 [Worker] Auto-repairing EXTRA cache index {cache_to_repair} with new valid answer.")
+                            FAQ_CACHE[cache_to_repair]["response_text"] = reply_text
+                            FAQ_CACHE[cache_to_repair]["emotion"] = emotion
+                            FAQ_CACHE[cache_to_repair]["audio_b64"] = audio_b64
+                            FAQ_CACHE[cache_to_repair].pop("audio_file", None)  # 古い音声の公開パスを捨てる
+                        elif cache_to_repair is None:
+                            logger.info(f"➕ [Worker] Appending new wild question to extra cache.")
+                            new_cache_entry = {
+                                "question": item.message_text,
+                                "response_text": reply_text,
+                                "emotion": emotion,
+                                "audio_b64": audio_b64,
+                                "norm_key": normalize_text(item.message_text),
+                                "source": "extra"
+                            }
+                            # 埋め込み (ネットワーク) はロックの外で計算する。照合時の埋め込みがあれば使い回す
+                            try:
+                                if query_embed is None and EMBEDDER is not None:
+                                    query_embed = EMBEDDER.embed_query(item.message_text)
+                            except Exception as e:
+                                logger.error(f"Failed to update embeddings dynamically: {e}")
+                            # 追記・索引・埋め込み行はまとめてロック下で行い、他Workerの追記と位置がずれないようにする
+                            with FAQ_INIT_LOCK:
+                                FAQ_CACHE.append(new_cache_entry)
+                                FAQ_INDEX.setdefault(new_cache_entry["norm_key"], len(FAQ_CACHE) - 1)
+                                if EMBEDDER is not None and FAQ_EMBEDDINGS is not None and len(FAQ_EMBEDDINGS) > 0:
+                                    if query_embed is not None:
+                                        new_embed = _unit_rows(query_embed)
+                                    else:
+                                        new_embed = np.zeros((1, FAQ_EMBEDDINGS.shape[1]), dtype=np.float32)  # 位置合わせ用
+                                    FAQ_EMBEDDINGS = np.vstack([FAQ_EMBEDDINGS, new_embed])
+                    
+                        # 🚀 書き込みはデバウンスしてバックグラウンドでまとめて行い、応答プロセスをブロックしない
+                        _schedule_extra_cache_write()
+                except Exception as e:
+                    logger.error(f"[Worker] Cache bookkeeping failed after delivering the answer: {e}")
+
+
             except Exception as e:
                 logger.error(f"[Worker] Task failed: {e}")
                 output_queue.put({"type": "error", "msg": f"AI/TTS Error: {str(e)}"})
+                result_event.set()
                 time.sleep(2)
 
     logger.info("[Worker] Thread stopping.")
@@ -281,7 +396,7 @@ def init_worker():
         stop_event = threading.Event()
         thread = threading.Thread(
             target=_worker_loop,
-            args=(st.session_state.queue, st.session_state.output_queue, stop_event, 
+            args=(st.session_state.queue, st.session_state.output_queue, st.session_state.result_event, stop_event, 
                   api_key, creds_json, p_key, c_email),
             daemon=True,
             name="avatar-worker"
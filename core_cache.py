@@ -0,0 +1,190 @@
+"""
+core_cache.py — Greeting cache persistence
+音声はBase64のままJSONへ埋め込まず、生のMP3として static/ に保存する (JSONはメタデータのみ)。
+読み込み時も音声は開かず、ブラウザが audio_url から直接取得する (HTTPキャッシュが効く)。
+書き込みはデバウンスしてバックグラウンドスレッドで行う (UIスレッドでディスクI/Oをしない)。
+回答音声も static/audio/<内容ハッシュ>.mp3 として公開し、キュー/session_state/WebSocketにはパスだけを流す。
+"""
+import atexit
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+from core_paths import PathManager, LOCAL_STATIC_DIR
+
+logger = logging.getLogger(__name__)
+
+GREETING_CACHE_FILE = LOCAL_STATIC_DIR / "greeting_cache.json"
+GREETING_AUDIO_FILE = LOCAL_STATIC_DIR / "greeting.mp3"
+GREETING_FLUSH_DELAY = 5  # seconds: 連続した保存要求をまとめる待ち時間
+
+AUDIO_DIR = LOCAL_STATIC_DIR / "audio"
+MAX_PUBLISHED_AUDIO = 200  # 公開音声の保持上限 (古いものから削除)
+
+
+def _atomic_write_bytes(path, data: bytes):
+    """一時ファイルに書いてから置き換える (読み込み側が書きかけのファイルを見ない)"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# ============================================================
+# Published answer audio (static/audio/)
+# ============================================================
+_published_audio = OrderedDict()  # static/audio/ 内のファイル名 (古い順)
+_audio_lock = threading.Lock()
+_audio_state = {"indexed": False, "disabled": False}
+
+
+def _index_published_audio():
+    """前回プロセスの公開音声を古い順に登録し直す (上限を超えた分は次の公開時に削除される)
+    初回の publish_audio() で _audio_lock 下から呼ばれる。static/ に書けない環境では公開を無効化する。"""
+    try:
+        AUDIO_DIR.mkdir(exist_ok=True)
+        with os.scandir(AUDIO_DIR) as it:
+            entries = sorted((e for e in it if e.name.endswith(".mp3")), key=lambda e: e.stat().st_mtime)
+    except OSError as e:
+        logger.warning(f"[Cache] Audio publishing disabled, falling back to base64: {e}")
+        _audio_state["disabled"] = True
+        return
+    for entry in entries:
+        _published_audio[entry.name] = None
+    _audio_state["indexed"] = True
+
+
+def publish_audio(audio_b64: str) -> str:
+    """音声を static/audio/<内容ハッシュ>.mp3 に書き出し、static/ からの相対パスを返す。
+    同じ音声 (FAQキャッシュ等) は同じファイルを使い回す。公開できない環境では OSError を送出する。"""
+    if _audio_state["disabled"]:
+        raise OSError("audio publishing is disabled")
+    audio_bytes = base64.b64decode(audio_b64)
+    name = f"{hashlib.blake2b(audio_bytes, digest_size=8).hexdigest()}.mp3"
+    with _audio_lock:
+        if not _audio_state["indexed"]:
+            _index_published_audio()
+            if _audio_state["disabled"]:
+                raise OSError("audio publishing is disabled")
+        if name in _published_audio:
+            _published_audio.move_to_end(name)
+        else:
+            _atomic_write_bytes(AUDIO_DIR / name, audio_bytes)
+            _published_audio[name] = None
+            while len(_published_audio) > MAX_PUBLISHED_AUDIO:
+                old_name, _ = _published_audio.popitem(last=False)
+                (AUDIO_DIR / old_name).unlink(missing_ok=True)
+    return f"{AUDIO_DIR.name}/{name}"
+
+
+def is_audio_published(path: str) -> bool:
+    """publish_audio() が返したパスがまだ公開中か (古いものは上限超過で削除されている)"""
+    with _audio_lock:
+        return path.rpartition("/")[2] in _published_audio
+
+
+# ============================================================
+# Greeting cache
+# ============================================================
+# 起動挨拶の生成指示 (app.py のLevel 2生成と、サーバー起動時の事前生成で共用)
+GREETING_PROMPT = "与那国島の町民の皆さんに自己紹介と、これからの島への想いを短く話してから、質問を募集してください。"
+
+_pending_greeting = [None]  # 最新の未書き込みタスク (古いものは上書きされて捨てられる)
+_greeting_dirty = threading.Event()
+_flush_lock = threading.Lock()
+_flusher_started = False
+
+
+def save_greeting_cache(task_data: dict):
+    """挨拶タスクを同期的に保存する。音声 → greeting.mp3 (生バイト)、テキスト等 → greeting_cache.json
+    音声は audio_b64、または公開済みの audio_file (static/ からの相対パス) から取得する。"""
+    # 音声を先に書く (JSONが存在しない音声を指す瞬間を作らない)
+    if task_data.get("audio_b64"):
+        audio_bytes = base64.b64decode(task_data["audio_b64"])
+    else:
+        audio_bytes = (LOCAL_STATIC_DIR / task_data["audio_file"]).read_bytes()
+    _atomic_write_bytes(GREETING_AUDIO_FILE, audio_bytes)
+
+    meta = {k: v for k, v in task_data.items() if k not in ("audio_b64", "audio_url")}
+    meta["audio_file"] = GREETING_AUDIO_FILE.name
+    # orjson はbytesを返すのでそのまま書き込む (テキストI/O・再エンコード不要)
+    _atomic_write_bytes(GREETING_CACHE_FILE, orjson.dumps(meta))
+
+
+def flush_greeting_cache():
+    """保留中の挨拶タスクがあれば書き出す (フラッシャースレッドと atexit から呼ばれる)"""
+    with _flush_lock:
+        # 先にフラグを下ろしてから取り出す: 取り出し後に届いた保存要求は再度dirtyになり、次の周期で書かれる
+        _greeting_dirty.clear()
+        task_data, _pending_greeting[0] = _pending_greeting[0], None
+        if task_data is None:
+            return
+        try:
+            save_greeting_cache(task_data)
+            logger.info(f"[Cache] Flushed initial greeting to physical file: {GREETING_CACHE_FILE.name}")
+        except Exception as e:
+            logger.warning(f"[Cache] Failed to save to physical file: {e}")
+
+
+def _flush_loop():
+    while True:
+        _greeting_dirty.wait()
+        time.sleep(GREETING_FLUSH_DELAY)  # この間に届いた保存要求は最新の1件にまとまる
+        flush_greeting_cache()
+
+
+def schedule_greeting_cache(task_data: dict):
+    """挨拶タスクの保存を予約する (即座に戻る)。実際の書き込みはデバウンス後にバックグラウンドで行う。"""
+    global _flusher_started
+    _pending_greeting[0] = task_data
+    _greeting_dirty.set()
+    if not _flusher_started:
+        with _flush_lock:
+            if not _flusher_started:
+                threading.Thread(target=_flush_loop, daemon=True, name="greeting-cache-flusher").start()
+                atexit.register(flush_greeting_cache)
+                _flusher_started = True
+
+
+def load_greeting_cache():
+    """挨拶タスクを復元する。音声は audio_url (static配信) として返し、Base64には戻さない。
+    旧形式 (audio_b64 埋め込みJSON) はそのまま返す。"""
+    if not GREETING_CACHE_FILE.exists():
+        return None
+    task_data = orjson.loads(GREETING_CACHE_FILE.read_bytes())
+
+    audio_file = task_data.pop("audio_file", None)
+    if audio_file:
+        if not (LOCAL_STATIC_DIR / audio_file).exists():
+            raise FileNotFoundError(f"Greeting audio missing: {audio_file}")
+        # ?v=task_id: 挨拶が作り直された時だけブラウザキャッシュを更新
+        task_data["audio_url"] = f"{PathManager.get_static_url(audio_file)}?v={task_data.get('task_id', '')}"
+    return task_data
+
+
+def ensure_greeting_cache(api_key: str = None) -> bool:
+    """greeting_cache.json が無ければ挨拶を Gemini + TTS で生成し、同期的に保存する (生成した場合 True)。
+    🌟 サーバー起動時 (streamlit_app.py の lifespan) に呼び、最初の訪問者に生成待ちをさせない。"""
+    if GREETING_CACHE_FILE.exists():
+        return False
+    from brain import generate_response, DEFAULT_NG_MESSAGE
+    from tts import synthesize_speech
+
+    reply_text, emotion = generate_response(GREETING_PROMPT, api_key=api_key or None, use_cache=False)
+    if reply_text == DEFAULT_NG_MESSAGE:
+        raise RuntimeError("Greeting generation returned the fallback message")
+    audio_b64 = synthesize_speech(reply_text, use_cache=False)
+    save_greeting_cache({
+        "task_id": f"{time.time_ns()}_greeting",
+        "emotion": emotion,
+        "response_text": reply_text,
+        "is_initial_greeting": True,
+        "audio_b64": audio_b64,
+    })
+    logger.info(f"[Cache] Pre-generated initial greeting: {GREETING_CACHE_FILE.name}")
+    return True
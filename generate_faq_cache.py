@@ -109,7 +109,7 @@ def pre_generate_answers(questions):
         
     cache_file = LOCAL_STATIC_DIR / "faq_cache.json"
     with open(cache_file, "w", encoding="utf-8") as f:
-        json.dump(faq_cache, f, ensure_ascii=False, indent=2)
+        json.dump(faq_cache, f, ensure_ascii=False, separators=(',', ':'))  # 実行時に読むファイルなのでコンパクトに
     
     logger.info(f"Saved FAQ cache to {cache_file.name}")
 
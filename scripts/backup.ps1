@@ -11,14 +11,18 @@ $TargetDir  = Join-Path $BackupRoot $Timestamp
 New-Item -ItemType Directory -Path $TargetDir -Force | Out-Null
 
 $filesToBackup = @(
-    "app.py", "core_ai_worker.py", "brain.py", "tts.py",
-    "youtube_monitor.py", "core_paths.py", "requirements.txt"
+    "streamlit_app.py", "app.py", "core_ai_worker.py", "core_cache.py",
+    "brain.py", "tts.py", "youtube_monitor.py", "core_paths.py",
+    "requirements.txt", ".streamlit\config.toml"
 )
 
 foreach ($f in $filesToBackup) {
     $src = Join-Path $SourceDir $f
     if (Test-Path $src) {
-        Copy-Item -Path $src -Destination $TargetDir
+        # .streamlit\config.toml などサブフォルダ内のファイルは同じ構成で保存する
+        $dst = Join-Path $TargetDir $f
+        New-Item -ItemType Directory -Path (Split-Path $dst -Parent) -Force | Out-Null
+        Copy-Item -Path $src -Destination $dst
     }
 }
 
@@ -22,8 +22,9 @@ if (-not (Test-Path $BackupDir)) {
 
 # 主要ファイルを上書き
 $filesToRestore = @(
-    "app.py", "core_ai_worker.py", "brain.py", "tts.py",
-    "youtube_monitor.py", "core_paths.py", "requirements.txt"
+    "streamlit_app.py", "app.py", "core_ai_worker.py", "core_cache.py",
+    "brain.py", "tts.py", "youtube_monitor.py", "core_paths.py",
+    "requirements.txt", ".streamlit\config.toml"
 )
 
 foreach ($f in $filesToRestore) {
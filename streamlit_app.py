@@ -0,0 +1,72 @@
+"""
+streamlit_app.py — ASGI entry point (st.App)
+`streamlit run streamlit_app.py` で起動する。画面の本体は app.py のまま。
+Starlette ベースのサーバー (st.App / 新しい Streamlit の標準) は app/static/ のファイルに Cache-Control を付けないため、
+?v=<内容ハッシュ> 付きURLにだけ長期キャッシュのヘッダーを付与する。
+lifespan で接続受付前に動画URL (内容ハッシュ) と起動挨拶キャッシュを準備し、最初の訪問者を待たせない。
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import streamlit as st
+from starlette.middleware import Middleware
+from streamlit.starlette import App
+
+logger = logging.getLogger(__name__)
+
+# ?v= 付きURLは内容が変われば別URLになるため、1年間・再検証なしでキャッシュさせてよい
+VERSIONED_STATIC_CACHE_CONTROL = b"public, max-age=31536000, immutable"
+
+
+class VersionedStaticCacheMiddleware:
+    """app/static/ への ?v= 付きリクエストの応答に長期キャッシュの Cache-Control を付ける (純ASGIミドルウェア)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or "/app/static/" not in scope["path"]
+            or b"v=" not in scope.get("query_string", b"")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message):
+            # 200 / 206 (動画のRangeリクエスト) のみ。404等はキャッシュさせない
+            if message["type"] == "http.response.start" and message["status"] in (200, 206):
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                headers.append((b"cache-control", VERSIONED_STATIC_CACHE_CONTROL))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
+
+
+def _prewarm():
+    """起動時の事前準備 (同期処理。失敗しても起動は止めず、従来どおり最初のセッションで生成する)"""
+    from core_paths import PathManager  # インポート時に動画ファイルの内容ハッシュを計算済みにする
+    from core_cache import ensure_greeting_cache
+
+    logger.info(f"[App] Video URLs ready: {len(PathManager.VIDEO_URL_MAP)} files")
+    try:
+        api_key = st.secrets.get("FINAL_MASTER_KEY") or st.secrets.get("GOOGLE_API_KEY") or ""
+        ensure_greeting_cache(api_key)
+    except Exception as e:
+        logger.warning(f"[App] Greeting pre-warm failed, first session will generate it: {e}")
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    # Gemini + TTS の待ち時間でイベントループを塞がないよう、スレッドで実行する
+    await asyncio.to_thread(_prewarm)
+    yield
+
+
+app = App(
+    "app.py",
+    lifespan=lifespan,
+    middleware=[Middleware(VersionedStaticCacheMiddleware)],
+)
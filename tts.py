@@ -3,6 +3,7 @@ tts.py — Google Cloud Text-to-Speech for Streamlit Cloud
 Generates MP3 audio from text, returns base64-encoded string for browser playback.
 """
 import base64
+import functools
 import json
 import logging
 import threading
@@ -104,6 +105,13 @@ def _get_tts_client_cached():
     return _create_client()
 
 
+@functools.lru_cache(maxsize=4)
+def _get_tts_client_for_worker(creds_json=None, private_key=None, client_email=None):
+    """Cached wrapper for worker threads (st.cache_resource is not used off the UI thread).
+    🚀 認証・gRPCチャネル確立を合成のたびに行わず、同じ認証情報ならクライアントを使い回す (スレッドセーフ)"""
+    return _create_client(creds_json, private_key, client_email)
+
+
 def synthesize_speech(text: str, creds_json: str = None, private_key: str = None, client_email: str = None, use_cache: bool = True) -> str:
     """
     Generate speech from text using Google Cloud TTS.
@@ -115,7 +123,7 @@ def synthesize_speech(text: str, creds_json: str = None, private_key: str = None
     if use_cache:
         client = _get_tts_client_cached()
     else:
-        client = _create_client(creds_json, private_key, client_email)
+        client = _get_tts_client_for_worker(creds_json, private_key, client_email)
 
     synthesis_input = texttospeech.SynthesisInput(text=text)
     voice = texttospeech.VoiceSelectionParams(
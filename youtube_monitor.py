@@ -8,16 +8,14 @@ import time
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime
-from queue import Queue
+from queue import SimpleQueue
 
-import pytchat
 import streamlit as st
 
-from brain import filter_inappropriate_comments
-
 logger = logging.getLogger(__name__)
 
 COMMENT_THROTTLE_INTERVAL = 10  # seconds between processing comments
+MAX_PENDING_ITEMS = 200  # 入力キューの上限 (Workerが詰まってもメモリが際限なく増えないように)
 
 
 @dataclass
@@ -30,11 +28,13 @@ class ChatItem:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-def _monitor_loop(video_id: str, queue: Queue, stop_event: threading.Event):
+def _monitor_loop(video_id: str, queue: SimpleQueue, stop_event: threading.Event):
     """
     Background thread function: poll YouTube live chat and enqueue valid messages.
     """
     logger.info(f"[YT Monitor] Starting for video_id={video_id}")
+    # 🚀 pytchatはモニタースレッド内でのみ必要 (ChatItemだけを使うapp.pyのimportを軽く保つ)
+    import pytchat
 
     while not stop_event.is_set():
         try:
@@ -56,6 +56,9 @@ def _monitor_loop(video_id: str, queue: Queue, stop_event: threading.Event):
                         # Only pickup a comment if it's been at least COMMENT_THROTTLE_INTERVAL seconds since the last one.
                         # This avoids filling the queue with spam, but also allows us to pick up the very first comment over the limit.
                         if now - last_comment_time >= COMMENT_THROTTLE_INTERVAL:
+                            if queue.qsize() >= MAX_PENDING_ITEMS:
+                                logger.warning("[YT Monitor] Queue full. Dropping comment.")
+                                break
                             item = ChatItem(
                                 message_text=c.message,
                                 author_name=c.author.name,
@@ -76,7 +79,7 @@ def _monitor_loop(video_id: str, queue: Queue, stop_event: threading.Event):
             stop_event.wait(30)
 
 
-def start_youtube_monitor(video_id: str, queue: Queue) -> tuple[threading.Thread, threading.Event]:
+def start_youtube_monitor(video_id: str, queue: SimpleQueue) -> tuple[threading.Thread, threading.Event]:
     """
     Start YouTube chat monitor in a background thread.
 